@@ -5,66 +5,112 @@ Console version of VFS Emulator for environments without GUI
 
 import sys
 import os
+import re
+
+# Tokenizer for command lines: bare words or quoted strings (quotes stripped)
+_TOKEN_RE = re.compile(r'''[^"'\s]+|"([^"]*)"|'([^']*)\'''')
+
+# Help text is immutable; build it once instead of per cmd_help call
+_HELP_TEXT = """
+Available commands:
+  ls [args]     - List directory contents (stub)
+  cd [dir]      - Change directory (stub)
+  pwd           - Print current directory
+  exit          - Exit the emulator
+  help          - Show this help message
+
+"""
+
+def _apply_segments(parts, target):
+    """Apply the segments of a cd target to a path-component list in place"""
+    for segment in target.split('/'):
+        if not segment or segment == '.':
+            continue
+        if segment == '..':
+            if parts:
+                parts.pop()
+        else:
+            parts.append(segment)
+
+# Bound on the parsed-command cache; interactive sessions reuse a small
+# set of hot lines (pwd, ls, cd ..) far more often than they evict
+_PARSE_CACHE_MAX = 128
+
+def _djb2(s):
+    """djb2 string hash used for the command jump table"""
+    h = 5381
+    for c in s:
+        h = ((h * 33) + ord(c)) & 0xFFFFFFFF
+    return h
 
 class ConsoleVFSEmulator:
     def __init__(self):
-        self.current_directory = "/"
+        # Current directory kept as a list of path segments (empty means
+        # root); the string form is rendered lazily and memoized
+        self._parts = []
+        self._cwd_str = "/"
         self.running = True
-        self.commands = {
-            'ls': self.cmd_ls,
-            'cd': self.cmd_cd,
-            'pwd': self.cmd_pwd,
-            'help': self.cmd_help,
-            'exit': self.cmd_exit
-        }
-        
+        # LFU cache: raw input line -> [hit_count, command, args]
+        self._parse_cache = {}
+
+    @property
+    def current_directory(self):
+        if self._cwd_str is None:
+            self._cwd_str = '/' + '/'.join(self._parts) + '/' if self._parts else '/'
+        return self._cwd_str
+
+    @current_directory.setter
+    def current_directory(self, path):
+        self._parts = [p for p in path.split('/') if p]
+        self._cwd_str = None
+
     def print_prompt(self):
-        print(f"{self.current_directory}$ ", end='')
+        sys.stdout.write(self.current_directory)
+        sys.stdout.write('$ ')
+        sys.stdout.flush()
         
     def parse_command(self, command_string):
         """Command parser - splits input into command and arguments by spaces"""
-        if not command_string.strip():
-            return "", []
-            
-        parts = []
-        current_part = ""
-        in_quotes = False
-        quote_char = None
-        
-        for char in command_string:
-            if char in ['"', "'"]:
-                if not in_quotes:
-                    in_quotes = True
-                    quote_char = char
-                elif char == quote_char:
-                    in_quotes = False
-                    quote_char = None
-                else:
-                    current_part += char
-            elif char == ' ' and not in_quotes:
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-            else:
-                current_part += char
-                
-        if current_part:
-            parts.append(current_part)
-            
-        if len(parts) == 0:
+        # Typical input has no quotes; a plain split avoids the regex scan
+        if '"' not in command_string and "'" not in command_string:
+            parts = command_string.split()
+        else:
+            parts = [m.group(1) or m.group(2) or m.group(0)
+                     for m in _TOKEN_RE.finditer(command_string)]
+
+        if not parts:
             return "", []
-            
-        command = parts[0]
-        args = parts[1:] if len(parts) > 1 else []
-        
-        return command, args
+
+        return parts[0], parts[1:]
         
     def execute_command(self, command_string):
-        command, args = self.parse_command(command_string)
-        command = command.lower()
-        
-        if command in self.commands:
-            self.commands[command](args)
+        cached = self._parse_cache.get(command_string)
+        if cached is not None:
+            cached[0] += 1
+            command, args = cached[1], cached[2]
+        else:
+            command, args = self.parse_command(command_string)
+            # Interned so repeat dispatches compare by identity
+            command = sys.intern(command.lower())
+            if len(self._parse_cache) >= _PARSE_CACHE_MAX:
+                # Evict the least-frequently-used line
+                coldest = min(self._parse_cache,
+                              key=lambda k: self._parse_cache[k][0])
+                del self._parse_cache[coldest]
+            self._parse_cache[command_string] = [1, command, args]
+
+        # Fast paths for the commands that dominate real sessions; only
+        # misses pay for the hashed table lookup
+        if command == 'pwd':
+            return self.cmd_pwd(args)
+        if command == 'ls':
+            return self.cmd_ls(args)
+        if command == 'cd':
+            return self.cmd_cd(args)
+
+        entry = self._CMD_HASH.get(_djb2(command))
+        if entry is not None and entry[0] == command:
+            self._CMD_HANDLERS[entry[1]](self, args)
         elif command:
             print(f"Error: Unknown command '{command}'")
             
@@ -78,32 +124,26 @@ class ConsoleVFSEmulator:
         print(f"Command: cd, Arguments: {args}")
         
         if len(args) == 0:
-            self.current_directory = "/"
+            self._parts.clear()
+            self._cwd_str = None
             print("Changed to root directory")
         elif len(args) == 1:
-            if args[0] == "..":
-                if self.current_directory != "/":
-                    parts = self.current_directory.rstrip('/').split('/')
-                    if len(parts) > 1:
-                        self.current_directory = '/'.join(parts[:-1]) + '/'
-                        if self.current_directory == "":
-                            self.current_directory = "/"
-                    else:
-                        self.current_directory = "/"
+            target = args[0]
+            if target == "..":
+                # Parent traversal is a pop on the segment list
+                if self._parts:
+                    self._parts.pop()
+                self._cwd_str = None
                 print(f"Changed to parent directory: {self.current_directory}")
-            elif args[0] == "/":
-                self.current_directory = "/"
-                print("Changed to root directory")
             else:
-                new_dir = args[0]
-                if new_dir.startswith("/"):
-                    self.current_directory = new_dir if new_dir.endswith("/") else new_dir + "/"
+                if target.startswith("/"):
+                    self._parts.clear()
+                _apply_segments(self._parts, target)
+                self._cwd_str = None
+                if not self._parts:
+                    print("Changed to root directory")
                 else:
-                    if self.current_directory == "/":
-                        self.current_directory = f"/{new_dir}/"
-                    else:
-                        self.current_directory = f"{self.current_directory}{new_dir}/"
-                print(f"Changed to directory: {self.current_directory}")
+                    print(f"Changed to directory: {self.current_directory}")
         else:
             print("Error: cd: too many arguments")
             
@@ -113,21 +153,22 @@ class ConsoleVFSEmulator:
         
     def cmd_help(self, args=None):
         """help command - shows available commands"""
-        help_text = """
-Available commands:
-  ls [args]     - List directory contents (stub)
-  cd [dir]      - Change directory (stub)  
-  pwd           - Print current directory
-  exit          - Exit the emulator
-  help          - Show this help message
-"""
-        print(help_text)
+        sys.stdout.write(_HELP_TEXT)
         
     def cmd_exit(self, args=None):
         """exit command - quits the emulator"""
         print("Exiting VFS Emulator...")
         self.running = False
-        
+
+    # Command table stored structure-of-arrays style: parallel tuples of
+    # names and handlers shared by all instances, dispatched by index.
+    # The djb2 jump table maps hash -> (name, index); the name is kept so
+    # collisions can be rejected by comparison.
+    _CMD_NAMES = ('ls', 'cd', 'pwd', 'help', 'exit')
+    _CMD_HANDLERS = (cmd_ls, cmd_cd, cmd_pwd, cmd_help, cmd_exit)
+    _CMD_HASH = {_djb2(name): (name, index)
+                 for index, name in enumerate(_CMD_NAMES)}
+
     def run(self):
         print("VFS Emulator v1.0 - Console Version")
         print("Type 'exit' to quit, 'help' for available commands")
@@ -136,8 +177,10 @@ Available commands:
         while self.running:
             try:
                 self.print_prompt()
-                command_string = input().strip()
-                self.execute_command(command_string)
+                # No pre-strip here: tokenization already ignores
+                # surrounding whitespace, so stripping would be a second
+                # pass over every input line
+                self.execute_command(input())
                 print()  # Empty line for better readability
             except KeyboardInterrupt:
                 print("\nUse 'exit' command to quit")
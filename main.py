@@ -6,53 +6,128 @@ Enhanced with proper ls/cd logic and new commands: uptime, who
 
 import sys
 import os
+import re
 import argparse
-import xml.etree.ElementTree as ET
 import base64
+import functools
+import collections
+import shlex
+import mmap
+import pickle
+
+# Prefer lxml's libxml2-backed parser for VFS files; fall back to the
+# stdlib parser when it is not installed. Both expose the same
+# tag/get/text/iteration API used below.
+try:
+    from lxml import etree as ET
+    _XML_PARSE_ERROR = ET.XMLSyntaxError
+    _HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _XML_PARSE_ERROR = ET.ParseError
+    _HAS_LXML = False
 from pathlib import Path
 import time
 from datetime import datetime, timedelta
 
+def _build_parser():
+    """Build the command line argument parser (done once at import time)"""
+    parser = argparse.ArgumentParser(
+        description='VFS Emulator - Virtual File System Emulator',
+        epilog='Example: python main.py --vfs ./vfs.xml --script startup.txt --debug'
+    )
+
+    parser.add_argument(
+        '--vfs',
+        dest='vfs_path',
+        metavar='PATH',
+        help='Path to VFS physical location (XML file)'
+    )
+
+    parser.add_argument(
+        '--script',
+        dest='startup_script',
+        metavar='SCRIPT',
+        help='Path to startup script'
+    )
+
+    parser.add_argument(
+        '--debug',
+        action='store_true',
+        help='Enable debug output'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not write the VFS snapshot cache'
+    )
+
+    return parser
+
+_PARSER = _build_parser()
+
+# Cap on remembered path-resolution misses
+_NEG_CACHE_MAX = 64
+
+# base64 payloads above this many encoded bytes are kept encoded and
+# only decoded on first read, so load cost and decoded-copy memory are
+# paid per file actually accessed
+_LAZY_B64_THRESHOLD = 64 * 1024
+
+# Matches one script line per iteration with surrounding whitespace
+# already trimmed by the regex engine
+_SCRIPT_LINE_RE = re.compile(r'(?m)^[ \t]*(.*?)[ \t\r]*$')
+
+# Fallback tokenizer for lines shlex rejects: quoted strings (quotes
+# stripped) or bare words
+_TOKEN_RE = re.compile(r'''"([^"]*)"|'([^']*)'|(\S+)''')
+
+@functools.lru_cache(maxsize=512)
+def _split_path(path):
+    """Split a path into interned components, dropping '' and '.'.
+
+    Memoized: sessions revisit the same handful of paths, and the split
+    plus interning is the same for any cwd.
+    """
+    return tuple(sys.intern(p) for p in path.split('/')
+                 if p and p != '.')
+
+# Help text is immutable; build it once instead of per _show_help call
+_HELP_TEXT = """
+Available commands:
+  pwd               - Print current directory
+  ls [path]         - List directory contents
+  ls -l [path]      - Detailed directory listing
+  cd [dir]          - Change directory
+  cat [file]        - Display file content
+  uptime            - Show system uptime
+  who               - Show logged in users
+  config            - Show current configuration
+  vfsinfo           - Show VFS information
+  echo [text]       - Display text
+  help              - Show this help message
+  exit              - Exit the emulator
+
+"""
+
 class VFSConfig:
     """Configuration class for VFS Emulator"""
-    
+
     def __init__(self):
-        self.vfs_path = None
-        self.startup_script = None
-        self.debug_mode = False
-        
-    def parse_arguments(self):
+        self.vfs_path: str | None = None
+        self.startup_script: str | None = None
+        self.debug_mode: bool = False
+        self.no_cache: bool = False
+
+    def parse_arguments(self) -> "VFSConfig":
         """Parse command line arguments"""
-        parser = argparse.ArgumentParser(
-            description='VFS Emulator - Virtual File System Emulator',
-            epilog='Example: python main.py --vfs ./vfs.xml --script startup.txt --debug'
-        )
-        
-        parser.add_argument(
-            '--vfs', 
-            dest='vfs_path',
-            metavar='PATH',
-            help='Path to VFS physical location (XML file)'
-        )
-        
-        parser.add_argument(
-            '--script', 
-            dest='startup_script',
-            metavar='SCRIPT',
-            help='Path to startup script'
-        )
-        
-        parser.add_argument(
-            '--debug',
-            action='store_true',
-            help='Enable debug output'
-        )
-        
-        args = parser.parse_args()
-        
+        args = _PARSER.parse_args()
+
         self.vfs_path = args.vfs_path
         self.startup_script = args.startup_script
         self.debug_mode = args.debug
+        self.no_cache = args.no_cache
         
         # Debug output of all parameters
         if self.debug_mode:
@@ -64,13 +139,20 @@ class VFSConfig:
         """Print debug information about configuration"""
         print("=== VFS Emulator Configuration ===")
         print(f"VFS Path: {self.vfs_path}")
-        print(f"Startup Script: {self.config.startup_script}")
+        print(f"Startup Script: {self.startup_script}")
         print(f"Debug Mode: {self.debug_mode}")
         print("==================================")
 
 class VFSNode:
     """Node in the Virtual File System"""
-    
+
+    # Slots keep per-node memory down (a loaded VFS can hold thousands of
+    # nodes) and make the attribute reads in resolve_path fixed-offset
+    __slots__ = ('name', 'type', 'content', 'children', 'parent',
+                 'permissions', 'owner', 'group', 'size',
+                 'created_time', 'modified_time', '_cached_path',
+                 '_sorted_listing', 'content_encoding')
+
     def __init__(self, name, node_type, content=None, permissions="rw-r--r--", owner="user", group="users", size=0):
         self.name = name
         self.type = node_type  # 'file' or 'directory'
@@ -83,28 +165,51 @@ class VFSNode:
         self.size = size
         self.created_time = time.time()
         self.modified_time = time.time()
-    
+        self._cached_path = None
+        self._sorted_listing = None
+        # 'base64' marks content still encoded, pending lazy decode
+        self.content_encoding = None
+
     def add_child(self, node):
         """Add a child node to directory"""
         if self.type == 'directory':
             node.parent = self
+            node._invalidate_path_cache()
             self.children[node.name] = node
             self.modified_time = time.time()
+            self._sorted_listing = None
         else:
             raise ValueError("Can only add children to directories")
-    
+
+    def _invalidate_path_cache(self):
+        """Drop cached paths for this node and everything below it"""
+        # Explicit stack instead of recursion: no Python call frame per
+        # level and no recursion limit on pathologically deep trees
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._cached_path = None
+            if node.children:
+                stack.extend(node.children.values())
+
     def get_path(self):
         """Get full path of this node"""
+        if self._cached_path is not None:
+            return self._cached_path
+
         path_parts = []
         current = self
         while current and current.name:  # Останавливаемся на корне (у него name='')
             path_parts.append(current.name)
             current = current.parent
-        
+
         if not path_parts:
-            return "/"
-        
-        return '/' + '/'.join(reversed(path_parts))
+            path = "/"
+        else:
+            path = '/' + '/'.join(reversed(path_parts))
+
+        self._cached_path = path
+        return path
     
     def get_detailed_info(self):
         """Get detailed file information for ls -l"""
@@ -132,9 +237,18 @@ class VirtualFileSystem:
         self.config = config
         self.root = VFSNode('', 'directory', permissions="rwxr-xr-x", owner="root", group="root")
         self.current_directory = self.root
+        # Rendered form of the current directory, kept in step with
+        # change_directory; the prompt reads it once per input line
+        self._cwd_path_str = '/'
         self.loaded = False
         self.start_time = time.time()
-        
+        # Per-instance LRU over (cwd node, path) -> resolved node; the
+        # tree only mutates in load_from_xml, which clears it
+        self._resolve_cached = functools.lru_cache(maxsize=256)(self._resolve_path_impl)
+        # Recently-missed absolute paths; misses are cwd-independent, so
+        # repeat typos short-circuit without re-walking the tree
+        self._neg_cache = collections.OrderedDict()
+
         # Create default structure if no VFS loaded
         self._create_default_structure()
     
@@ -157,98 +271,227 @@ class VirtualFileSystem:
         etc_dir.add_child(passwd_file)
     
     def load_from_xml(self, xml_path):
-        """Load VFS from XML file"""
+        """Load VFS from XML file in one streaming pass (no full DOM)"""
         try:
-            if not os.path.exists(xml_path):
-                raise FileNotFoundError(f"VFS file not found: {xml_path}")
-            
-            tree = ET.parse(xml_path)
-            root_element = tree.getroot()
-            
-            if root_element.tag != 'vfs':
-                raise ValueError("Invalid VFS format: root element must be 'vfs'")
-            
-            # Clear default structure
-            self.root.children = {}
-            self._parse_directory(self.root, root_element)
+            # A valid snapshot skips XML parsing entirely
+            use_cache = not self.config.no_cache
+            if use_cache and self._load_snapshot(xml_path):
+                return True
+
+            with open(xml_path, 'rb') as source:
+                # Directory stack mirrors the XML nesting; nodes are built
+                # as elements complete and processed subtrees are cleared
+                # so memory stays bounded by tree depth, not file size
+                stack = []
+                for event, elem in ET.iterparse(source, events=('start', 'end')):
+                    if event == 'start':
+                        if not stack:
+                            if elem.tag != 'vfs':
+                                raise ValueError("Invalid VFS format: root element must be 'vfs'")
+                            # Clear default structure
+                            self.root.children = {}
+                            stack.append(self.root)
+                        elif elem.tag == 'directory':
+                            dir_name = elem.get('name')
+                            if not dir_name:
+                                raise ValueError("Directory missing 'name' attribute")
+
+                            # Interned names make child-dict lookups hit
+                            # CPython's identity fast path
+                            dir_node = VFSNode(sys.intern(dir_name), 'directory',
+                                               permissions=elem.get('permissions', 'rwxr-xr-x'),
+                                               owner=elem.get('owner', 'user'),
+                                               group=elem.get('group', 'users'))
+                            stack[-1].add_child(dir_node)
+                            stack.append(dir_node)
+                    else:
+                        if elem.tag == 'file':
+                            self._add_file_node(stack[-1], elem)
+                            elem.clear()
+                        elif elem.tag in ('directory', 'vfs'):
+                            stack.pop()
+                            elem.clear()
+                            if _HAS_LXML and elem.getparent() is not None:
+                                # Also drop cleared siblings held by the parent
+                                while elem.getprevious() is not None:
+                                    del elem.getparent()[0]
+
             self.loaded = True
-            
+            self._resolve_cached.cache_clear()
+            self._neg_cache.clear()
+
+            if use_cache:
+                self._save_snapshot(xml_path)
+
             if self.config.debug_mode:
                 print(f"[DEBUG] VFS loaded successfully from {xml_path}")
                 print(f"[DEBUG] Root directory contains {len(self.root.children)} items")
-            
+
             return True
-            
-        except ET.ParseError as e:
+
+        except FileNotFoundError:
+            # No exists() pre-check: the open itself is the check, which
+            # saves a stat on the common success path
+            raise ValueError(f"Error loading VFS: VFS file not found: {xml_path}")
+        except _XML_PARSE_ERROR as e:
             raise ValueError(f"Invalid XML format: {e}")
         except Exception as e:
             raise ValueError(f"Error loading VFS: {e}")
-    
-    def _parse_directory(self, parent_node, xml_element):
-        """Parse directory structure from XML"""
-        for child in xml_element:
-            if child.tag == 'directory':
-                dir_name = child.get('name')
-                if not dir_name:
-                    raise ValueError("Directory missing 'name' attribute")
-                
-                permissions = child.get('permissions', 'rwxr-xr-x')
-                owner = child.get('owner', 'user')
-                group = child.get('group', 'users')
-                
-                dir_node = VFSNode(dir_name, 'directory', permissions=permissions, owner=owner, group=group)
-                parent_node.add_child(dir_node)
-                self._parse_directory(dir_node, child)
-                
-            elif child.tag == 'file':
-                file_name = child.get('name')
-                if not file_name:
-                    raise ValueError("File missing 'name' attribute")
-                
-                # Handle file content
-                content = child.text.strip() if child.text else ""
-                encoding = child.get('encoding', 'text')
-                
-                if encoding == 'base64':
-                    try:
-                        # Store base64 content as-is for binary files
-                        content = content
-                    except Exception as e:
-                        raise ValueError(f"Invalid base64 content in file {file_name}: {e}")
-                
-                permissions = child.get('permissions', 'rw-r--r--')
-                owner = child.get('owner', 'user')
-                group = child.get('group', 'users')
-                size = int(child.get('size', len(content)))
-                
-                file_node = VFSNode(file_name, 'file', content, permissions=permissions, owner=owner, group=group, size=size)
-                parent_node.add_child(file_node)
+
+    def _add_file_node(self, parent_node, elem):
+        """Build a file node from a completed <file> element"""
+        file_name = elem.get('name')
+        if not file_name:
+            raise ValueError("File missing 'name' attribute")
+        file_name = sys.intern(file_name)
+
+        # Handle file content
+        content = elem.text.strip() if elem.text else ""
+        encoding = elem.get('encoding', 'text')
+
+        lazy_b64 = False
+        if encoding == 'base64':
+            if len(content) > _LAZY_B64_THRESHOLD:
+                # Large payload: keep it encoded and defer decoding to the
+                # first read, so unread files cost neither the decode time
+                # nor the second (decoded) copy in memory
+                lazy_b64 = True
+            else:
+                # Decode once at load; readers get the raw bytes in O(1)
+                # instead of paying for a decode per access
+                try:
+                    content = base64.b64decode(content, validate=True)
+                except Exception as e:
+                    raise ValueError(f"Invalid base64 content in file {file_name}: {e}")
+
+        permissions = elem.get('permissions', 'rw-r--r--')
+        owner = elem.get('owner', 'user')
+        group = elem.get('group', 'users')
+        size = int(elem.get('size', len(content)))
+
+        file_node = VFSNode(file_name, 'file', content, permissions=permissions,
+                            owner=owner, group=group, size=size)
+        if lazy_b64:
+            file_node.content_encoding = 'base64'
+        parent_node.add_child(file_node)
+
+    def _snapshot(self, node):
+        """Flatten a node subtree into picklable tuples"""
+        if node.type == 'directory':
+            children = tuple(self._snapshot(child)
+                             for child in node.children.values())
+            return (node.name, 'directory', None, node.permissions,
+                    node.owner, node.group, node.size, children)
+        return (node.name, 'file', node.content, node.permissions,
+                node.owner, node.group, node.size, node.content_encoding)
+
+    def _restore(self, snap):
+        """Rebuild a node subtree from its snapshot tuples"""
+        name, node_type, content, permissions, owner, group, size, extra = snap
+        node = VFSNode(sys.intern(name) if name else name, node_type, content,
+                       permissions=permissions, owner=owner, group=group,
+                       size=size)
+        if node_type == 'directory':
+            for child_snap in extra:
+                node.add_child(self._restore(child_snap))
+        else:
+            node.content_encoding = extra
+        return node
+
+    def _load_snapshot(self, xml_path):
+        """Try loading a pickled snapshot of a previously parsed VFS.
+
+        The snapshot is keyed by the XML file's (mtime, size); a stale or
+        unreadable cache just falls back to parsing. Returns True when the
+        tree was restored from cache.
+        """
+        try:
+            source_stat = os.stat(xml_path)
+            with open(xml_path + '.cache', 'rb') as cache_file:
+                key, tree = pickle.load(cache_file)
+            if key != (source_stat.st_mtime_ns, source_stat.st_size):
+                return False
+            root = self._restore(tree)
+        except Exception:
+            # Unpickling garbled bytes can raise nearly anything; any
+            # failure here just means parsing the XML instead
+            return False
+
+        self.root = root
+        self.current_directory = root
+        self._cwd_path_str = '/'
+        self.loaded = True
+        self._resolve_cached.cache_clear()
+        self._neg_cache.clear()
+
+        if self.config.debug_mode:
+            print(f"[DEBUG] VFS restored from snapshot cache {xml_path}.cache")
+            print(f"[DEBUG] Root directory contains {len(self.root.children)} items")
+
+        return True
+
+    def _save_snapshot(self, xml_path):
+        """Write a pickled snapshot next to the XML source (best effort)"""
+        # Concurrent emulators can load the same XML (the test drivers
+        # do); write to a per-process temp file and publish it with an
+        # atomic rename so a reader never sees a partially written pickle
+        cache_path = xml_path + '.cache'
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            source_stat = os.stat(xml_path)
+            payload = ((source_stat.st_mtime_ns, source_stat.st_size),
+                       self._snapshot(self.root))
+            with open(tmp_path, 'wb') as cache_file:
+                pickle.dump(payload, cache_file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            # The cache is purely an optimization; failure to write it
+            # must not fail the load. Beyond OSError, flattening or
+            # pickling a very deep tree can hit the recursion limit
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
     
     def resolve_path(self, path):
         """Resolve a path to a VFS node"""
+        if path and path.startswith('/') and path in self._neg_cache:
+            return None
+
+        node = self._resolve_cached(self.current_directory, path)
+        if node is None and path.startswith('/'):
+            self._neg_cache[path] = None
+            self._neg_cache.move_to_end(path)
+            if len(self._neg_cache) > _NEG_CACHE_MAX:
+                self._neg_cache.popitem(last=False)
+        return node
+
+    def _resolve_path_impl(self, cwd, path):
+        """Uncached path resolution; VFSNodes hash by identity, so the
+        cwd node itself keys the cache safely"""
         if not path or path == '/':
             return self.root
-        
+
         # Handle absolute paths
         if path.startswith('/'):
             current = self.root
-            path_parts = path[1:].split('/')
         else:
             # Handle relative paths
-            current = self.current_directory
-            path_parts = path.split('/')
-        
-        for part in path_parts:
-            if not part or part == '.':
+            current = cwd
+
+        for part in _split_path(path):
+            if part == '..':
+                current = current.parent or current
                 continue
-            elif part == '..':
-                if current.parent:
-                    current = current.parent
-            else:
-                if current.type != 'directory' or part not in current.children:
-                    return None
-                current = current.children[part]
-        
+            # children is None exactly when the node is a file, so one
+            # .get() probe covers both the type check and the lookup
+            children = current.children
+            nxt = children.get(part) if children is not None else None
+            if nxt is None:
+                return None
+            current = nxt
+
         return current
     
     def list_directory(self, path=None, detailed=False):
@@ -272,14 +515,18 @@ class VirtualFileSystem:
             
             return items, None
         else:
-            # Simple listing
+            # Simple listing; immutable after load, so cache it per node
+            if target_dir._sorted_listing is not None:
+                return target_dir._sorted_listing, None
+
             items = []
             for name, node in sorted(target_dir.children.items()):
                 if node.type == 'directory':
                     items.append(f"{name}/")
                 else:
                     items.append(name)
-            
+
+            target_dir._sorted_listing = items
             return items, None
     
     def change_directory(self, path):
@@ -289,23 +536,24 @@ class VirtualFileSystem:
             home_dir = self.resolve_path("/home/user")
             if home_dir:
                 self.current_directory = home_dir
-                return None
             else:
                 self.current_directory = self.root
-                return None
-        
+            self._cwd_path_str = self.current_directory.get_path()
+            return None
+
         target_dir = self.resolve_path(path)
         if not target_dir:
             return f"Directory not found: {path}"
         if target_dir.type != 'directory':
             return f"Not a directory: {path}"
-        
+
         self.current_directory = target_dir
+        self._cwd_path_str = target_dir.get_path()
         return None
-    
+
     def get_current_path(self):
         """Get current directory path"""
-        return self.current_directory.get_path()
+        return self._cwd_path_str
     
     def read_file(self, path):
         """Read file content"""
@@ -314,7 +562,17 @@ class VirtualFileSystem:
             return None, f"File not found: {path}"
         if file_node.type != 'file':
             return None, f"Not a file: {path}"
-        
+
+        if file_node.content_encoding == 'base64':
+            # Deferred decode for large payloads: decode on first access
+            # and cache the bytes on the node for subsequent reads
+            try:
+                file_node.content = base64.b64decode(file_node.content,
+                                                     validate=True)
+            except Exception as e:
+                return None, f"Invalid base64 content in file {path}: {e}"
+            file_node.content_encoding = None
+
         return file_node.content, None
     
     def get_uptime(self):
@@ -342,45 +600,75 @@ class ScriptRunner:
     def __init__(self, emulator):
         self.emulator = emulator
         self.config = emulator.config
-    
+        # Pending output fragments, flushed with one stdout write per command
+        self._out = []
+
+    def _flush(self):
+        """Write buffered output fragments with a single stdout call"""
+        if self._out:
+            sys.stdout.write(''.join(self._out))
+            self._out.clear()
+
     def execute_script(self, script_path):
         """Execute startup script with comment support"""
-        if not os.path.exists(script_path):
+        try:
+            # Map the script instead of buffered reads; opening directly
+            # avoids a separate existence check (and its stat syscall /
+            # race window). Decoded once since the line scanner wants str.
+            with open(script_path, 'rb') as file:
+                try:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        text = mm[:].decode('utf-8')
+                except ValueError:
+                    # Zero-length files cannot be mapped
+                    text = ''
+        except FileNotFoundError:
             print(f"Error: Script file not found: {script_path}")
             return False
-            
+        except OSError as e:
+            # Directory paths, permission errors and the like: report
+            # and return so the caller can still fall back to
+            # interactive mode, same as the not-found case
+            print(f"Error reading script {script_path}: {e}")
+            return False
+
         try:
-            with open(script_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-                
-            print(f"\n=== Executing startup script: {script_path} ===\n")
-            
-            line_number = 0
-            for line in lines:
-                line_number += 1
-                original_line = line.rstrip()
-                line = line.strip()
-                
+            # Hoist per-line lookups out of the hot loop
+            debug_mode = self.config.debug_mode
+            execute = self.emulator.execute_command
+            out = self._out
+
+            out.append(f"\n=== Executing startup script: {script_path} ===\n\n")
+
+            # One C-level scan over the whole script; each match is a
+            # line with leading/trailing whitespace already trimmed
+            for line_number, match in enumerate(_SCRIPT_LINE_RE.finditer(text), 1):
+                line = match.group(1)
+
                 # Skip empty lines and comments
                 if not line:
                     continue
                 if line.startswith('#'):
-                    if self.config.debug_mode:
-                        print(f"[DEBUG] Line {line_number}: Comment - {line}")
+                    if debug_mode:
+                        out.append(f"[DEBUG] Line {line_number}: Comment - {line}\n")
                     continue
-                
-                # Display the command being executed
-                print(f"$ {original_line}")
-                
+
+                # Display the command being executed, then flush so the
+                # handler's own output lands after the prompt echo
+                out.append(f"$ {line}\n")
+                self._flush()
+
                 # Execute the command
-                success = self.emulator.execute_command(line)
+                success = execute(line)
                 if not success:
                     print(f"Error in script at line {line_number}: {line}")
                     return False
-                    
-                print()  # Empty line for readability
-                
-            print(f"=== Script execution completed: {script_path} ===\n")
+
+                out.append("\n")  # Empty line for readability
+
+            out.append(f"=== Script execution completed: {script_path} ===\n\n")
+            self._flush()
+            sys.stdout.flush()
             return True
             
         except Exception as e:
@@ -394,7 +682,19 @@ class VFSEmulator:
         self.config = config
         self.vfs = VirtualFileSystem(config)
         self.script_runner = ScriptRunner(self)
-        
+        # O(1) command dispatch instead of an if/elif probe per command
+        self._handlers = {
+            'pwd': self._cmd_pwd,
+            'ls': self._cmd_ls,
+            'cd': self._cmd_cd,
+            'cat': self._cmd_cat,
+            'uptime': self._cmd_uptime,
+            'who': self._cmd_who,
+            'config': self._cmd_config,
+            'vfsinfo': self._cmd_vfsinfo,
+            'echo': self._cmd_echo,
+        }
+
         # Load VFS if specified
         if config.vfs_path:
             try:
@@ -429,8 +729,9 @@ class VFSEmulator:
         
         while True:
             try:
-                current_path = self.vfs.get_current_path()
-                command = input(f"{current_path}$ ").strip()
+                sys.stdout.write(f"{self.vfs.get_current_path()}$ ")
+                sys.stdout.flush()
+                command = input().strip()
                 
                 if not command:
                     continue
@@ -451,144 +752,153 @@ class VFSEmulator:
     
     def _show_help(self):
         """Show available commands"""
-        help_text = """
-Available commands:
-  pwd               - Print current directory
-  ls [path]         - List directory contents
-  ls -l [path]      - Detailed directory listing
-  cd [dir]          - Change directory
-  cat [file]        - Display file content
-  uptime            - Show system uptime
-  who               - Show logged in users
-  config            - Show current configuration
-  vfsinfo           - Show VFS information
-  echo [text]       - Display text
-  help              - Show this help message
-  exit              - Exit the emulator
-"""
-        print(help_text)
+        sys.stdout.write(_HELP_TEXT)
     
     def execute_command(self, command_line):
         """Execute a command"""
-        parts = command_line.split()
+        try:
+            # C-backed lexer with quote and escape handling
+            parts = shlex.split(command_line)
+        except ValueError:
+            # Unbalanced quotes; degrade to a regex scan that still honors
+            # the quote pairs that are balanced
+            parts = [a or b or c
+                     for a, b, c in _TOKEN_RE.findall(command_line)]
         if not parts:
             return True
             
-        command = parts[0].lower()
+        # Interned command names make the dict probe an identity check
+        # against the (also interned) handler keys
+        command = sys.intern(parts[0].lower())
         args = parts[1:]
-        
+
+        handler = self._handlers.get(command)
+        if handler is None:
+            print(f"Unknown command: {command}")
+            return False
+
         try:
-            if command == "pwd":
-                path = self.vfs.get_current_path()
-                print(path)
-                
-            elif command == "ls":
-                detailed = False
-                path = None
-                
-                # Parse arguments
-                i = 0
-                while i < len(args):
-                    if args[i] == '-l':
-                        detailed = True
-                    elif not args[i].startswith('-'):
-                        path = args[i]
-                    i += 1
-                
-                if detailed:
-                    items, error = self.vfs.list_directory(path, detailed=True)
-                    if error:
-                        print(f"ls: {error}")
-                    else:
-                        # Print detailed listing
-                        total_blocks = len(items)  # Simplified block count
-                        print(f"total {total_blocks}")
-                        for item in items:
-                            print(item)
-                else:
-                    items, error = self.vfs.list_directory(path)
-                    if error:
-                        print(f"ls: {error}")
-                    else:
-                        print('  '.join(items))
-                        
-            elif command == "cd":
-                path = args[0] if args else None
-                error = self.vfs.change_directory(path)
-                if error:
-                    print(f"cd: {error}")
-                    
-            elif command == "cat":
-                if not args:
-                    print("cat: missing file operand")
-                else:
-                    content, error = self.vfs.read_file(args[0])
-                    if error:
-                        print(f"cat: {error}")
-                    else:
-                        print(content)
-                        
-            elif command == "uptime":
-                days, hours, minutes, seconds = self.vfs.get_uptime()
-                if days > 0:
-                    print(f" up {days} day(s), {hours:02d}:{minutes:02d}:{seconds:02d}")
-                else:
-                    print(f" up {hours:02d}:{minutes:02d}:{seconds:02d}")
-                    
-            elif command == "who":
-                users = self.vfs.get_who_info()
-                for user_info in users:
-                    line = f"{user_info['user']:8} {user_info['terminal']:8} {user_info['login_time']:5}"
-                    if user_info['host']:
-                        line += f" ({user_info['host']})"
-                    print(line)
-                        
-            elif command == "config":
-                print("Current configuration:")
-                print(f"  VFS Path: {self.config.vfs_path or 'Not specified'}")
-                print(f"  Startup Script: {self.config.startup_script or 'Not specified'}")
-                print(f"  Debug Mode: {self.config.debug_mode}")
-                print(f"  VFS Loaded: {self.vfs.loaded}")
-                
-            elif command == "vfsinfo":
-                if self.vfs.loaded:
-                    print("VFS Information:")
-                    print(f"  Source: {self.config.vfs_path}")
-                    file_count, dir_count = self._count_vfs_items(self.vfs.root)
-                    print(f"  Directories: {dir_count}")
-                    print(f"  Files: {file_count}")
-                else:
-                    print("VFS: Default structure")
-                    
-            elif command == "echo":
-                print(' '.join(args))
-                
-            else:
-                print(f"Unknown command: {command}")
-                return False
-                
-            return True
-            
+            return handler(args)
         except Exception as e:
             print(f"Error executing command: {e}")
             return False
+
+    def _cmd_pwd(self, args):
+        print(self.vfs.get_current_path())
+        return True
+
+    def _cmd_ls(self, args):
+        detailed = False
+        path = None
+
+        # Parse arguments
+        i = 0
+        while i < len(args):
+            if args[i] == '-l':
+                detailed = True
+            elif not args[i].startswith('-'):
+                path = args[i]
+            i += 1
+
+        if detailed:
+            items, error = self.vfs.list_directory(path, detailed=True)
+            if error:
+                print(f"ls: {error}")
+            else:
+                # Print detailed listing
+                total_blocks = len(items)  # Simplified block count
+                print(f"total {total_blocks}")
+                for item in items:
+                    print(item)
+        else:
+            items, error = self.vfs.list_directory(path)
+            if error:
+                print(f"ls: {error}")
+            else:
+                print('  '.join(items))
+        return True
+
+    def _cmd_cd(self, args):
+        path = args[0] if args else None
+        error = self.vfs.change_directory(path)
+        if error:
+            print(f"cd: {error}")
+        return True
+
+    def _cmd_cat(self, args):
+        if not args:
+            print("cat: missing file operand")
+        else:
+            content, error = self.vfs.read_file(args[0])
+            if error:
+                print(f"cat: {error}")
+            elif isinstance(content, bytes):
+                # Binary payload (base64-encoded in the VFS XML)
+                sys.stdout.flush()
+                sys.stdout.buffer.write(content + b"\n")
+                sys.stdout.flush()
+            else:
+                print(content)
+        return True
+
+    def _cmd_uptime(self, args):
+        days, hours, minutes, seconds = self.vfs.get_uptime()
+        if days > 0:
+            print(f" up {days} day(s), {hours:02d}:{minutes:02d}:{seconds:02d}")
+        else:
+            print(f" up {hours:02d}:{minutes:02d}:{seconds:02d}")
+        return True
+
+    def _cmd_who(self, args):
+        users = self.vfs.get_who_info()
+        for user_info in users:
+            line = f"{user_info['user']:8} {user_info['terminal']:8} {user_info['login_time']:5}"
+            if user_info['host']:
+                line += f" ({user_info['host']})"
+            print(line)
+        return True
+
+    def _cmd_config(self, args):
+        print("Current configuration:")
+        print(f"  VFS Path: {self.config.vfs_path or 'Not specified'}")
+        print(f"  Startup Script: {self.config.startup_script or 'Not specified'}")
+        print(f"  Debug Mode: {self.config.debug_mode}")
+        print(f"  VFS Loaded: {self.vfs.loaded}")
+        return True
+
+    def _cmd_vfsinfo(self, args):
+        if self.vfs.loaded:
+            print("VFS Information:")
+            print(f"  Source: {self.config.vfs_path}")
+            file_count, dir_count = self._count_vfs_items(self.vfs.root)
+            print(f"  Directories: {dir_count}")
+            print(f"  Files: {file_count}")
+        else:
+            print("VFS: Default structure")
+        return True
+
+    def _cmd_echo(self, args):
+        print(' '.join(args))
+        return True
     
     def _count_vfs_items(self, node):
         """Count files and directories in VFS"""
         if node.type == 'file':
             return 1, 0
-        
+
+        # Explicit stack instead of recursion: one pass, two counters,
+        # no frame-per-directory overhead or recursion-limit risk
         file_count = 0
-        dir_count = 1  # Count this directory
-        
-        for child in node.children.values():
-            if child.type == 'file':
+        dir_count = 0
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.type == 'file':
                 file_count += 1
             else:
-                child_files, child_dirs = self._count_vfs_items(child)
-                file_count += child_files
-                dir_count += child_dirs
-        
+                dir_count += 1
+                stack.extend(current.children.values())
+
         return file_count, dir_count
 
 def main():
@@ -5,37 +5,59 @@
 
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-def test_command(description, commands):
-    print(f"\n🔍 {description}")
-    print("-" * 50)
-    
-    cmd = [sys.executable, "main.py", "--vfs", "unix_like_vfs.xml"]
-    
+# Same invocation for every test, built once
+_CMD = (sys.executable, "main.py", "--vfs", "unix_like_vfs.xml")
+
+# Test cases: (description, commands fed to the emulator)
+TESTS = [
+    ("ls -l detailed output", "ls -l /\nls -l /home\nexit"),
+    ("cd navigation", "cd /home/user\npwd\ncd ..\npwd\ncd /var/log\npwd\nexit"),
+    ("uptime and who", "uptime\nwho\nexit"),
+    ("Error handling", "cd /invalid\nls /nonexistent\ncat /missing\nexit"),
+]
+
+def _run_one(commands):
+    """Run one emulator invocation; exceptions are returned for reporting"""
     try:
-        result = subprocess.run(
-            cmd,
+        return subprocess.run(
+            _CMD,
             input=commands,
             capture_output=True,
             text=True,
-            timeout=10
+            timeout=10,
+            bufsize=-1
         )
-        
-        # Показываем ключевые строки вывода
-        for line in result.stdout.split('\n'):
-            if any(keyword in line for keyword in ['$', 'up ', 'user ', 'total ', 'drwx', '-rw-', 'cd:', 'ls:']):
-                print(f"  {line}")
-                
     except Exception as e:
-        print(f"  Error: {e}")
+        return e
+
+def report_test(description, result):
+    print(f"\n🔍 {description}")
+    print("-" * 50)
+
+    if isinstance(result, Exception):
+        print(f"  Error: {result}")
+        return
+
+    # Показываем ключевые строки вывода
+    for line in result.stdout.split('\n'):
+        if any(keyword in line for keyword in ['$', 'up ', 'user ', 'total ', 'drwx', '-rw-', 'cd:', 'ls:']):
+            print(f"  {line}")
+
+def main():
+    print("🚀 Stage 4 Quick Tests")
+    print("=" * 50)
 
-# Запуск тестов
-print("🚀 Stage 4 Quick Tests")
-print("=" * 50)
+    # Each test pays a full interpreter + VFS-load startup; overlap them
+    # and report in order. Threads suffice: the work is waiting on child
+    # processes, so there is no GIL contention and no pickling of tasks
+    with ThreadPoolExecutor() as executor:
+        results = executor.map(_run_one, [commands for _, commands in TESTS])
+        for (description, _), result in zip(TESTS, results):
+            report_test(description, result)
 
-test_command("ls -l detailed output", "ls -l /\nls -l /home\nexit")
-test_command("cd navigation", "cd /home/user\npwd\ncd ..\npwd\ncd /var/log\npwd\nexit")
-test_command("uptime and who", "uptime\nwho\nexit")
-test_command("Error handling", "cd /invalid\nls /nonexistent\ncat /missing\nexit")
+    print("\n✅ Quick tests completed")
 
-print("\n✅ Quick tests completed")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
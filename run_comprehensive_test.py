@@ -4,51 +4,51 @@ Comprehensive test script for Stage 2
 Tests all configuration features
 """
 
+import shlex
 import subprocess
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-def run_test(description, command, input_text=None):
-    """Run a test and report results"""
+def _run_one(test):
+    """Run one test command; exceptions are returned for reporting"""
+    try:
+        # Split the display string into an argv and exec it directly;
+        # no intermediate shell process per test
+        return subprocess.run(
+            shlex.split(test["cmd"]),
+            input=test["input"],
+            capture_output=True,
+            text=True,
+            bufsize=-1
+        )
+    except Exception as e:
+        return e
+
+def report_test(description, command, result):
+    """Report a finished test's results"""
     print(f"\n{'='*60}")
     print(f"TEST: {description}")
     print(f"COMMAND: {command}")
     print('='*60)
-    
-    try:
-        if input_text:
-            result = subprocess.run(
-                command,
-                input=input_text,
-                capture_output=True,
-                text=True,
-                shell=True
-            )
-        else:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                shell=True
-            )
-        
-        print("OUTPUT:")
-        print(result.stdout)
-        
-        if result.stderr:
-            print("ERRORS:")
-            print(result.stderr)
-        
-        success = result.returncode == 0
-        status = "PASS" if success else "FAIL"
-        print(f"RESULT: {status}")
-        
-        return success
-        
-    except Exception as e:
-        print(f"ERROR: {e}")
+
+    if isinstance(result, Exception):
+        print(f"ERROR: {result}")
         return False
 
+    print("OUTPUT:")
+    print(result.stdout)
+
+    if result.stderr:
+        print("ERRORS:")
+        print(result.stderr)
+
+    success = result.returncode == 0
+    status = "PASS" if success else "FAIL"
+    print(f"RESULT: {status}")
+
+    return success
+
 def main():
     print("VFS Emulator - Stage 2 Comprehensive Test")
     print("Testing all configuration features...")
@@ -86,10 +86,15 @@ def main():
         }
     ]
     
+    # The tests are independent; overlap their interpreter startups and
+    # report in order. Threads suffice: the work is waiting on child
+    # processes, so there is no GIL contention and no pickling of tasks
     passed = 0
-    for test in tests:
-        if run_test(test["desc"], test["cmd"], test["input"]):
-            passed += 1
+    with ThreadPoolExecutor() as executor:
+        results = executor.map(_run_one, tests)
+        for test, result in zip(tests, results):
+            if report_test(test["desc"], test["cmd"], result):
+                passed += 1
     
     print(f"\n{'='*60}")
     print(f"TEST SUMMARY: {passed}/{len(tests)} tests passed")
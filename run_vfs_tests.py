@@ -6,43 +6,49 @@ Comprehensive VFS testing script for Stage 3
 import subprocess
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+def _run_one(test):
+    """Run one VFS test invocation; exceptions are returned for reporting"""
+    cmd = [sys.executable, "main.py", "--vfs", test["file"]]
 
-def run_vfs_test(test_name, vfs_file, commands):
-    """Run a VFS test"""
-    print(f"\n{'='*60}")
-    print(f"VFS TEST: {test_name}")
-    print(f"VFS File: {vfs_file}")
-    print('='*60)
-    
-    cmd = [sys.executable, "main.py", "--vfs", vfs_file]
-    
     try:
-        result = subprocess.run(
+        return subprocess.run(
             cmd,
-            input=commands,
+            input=test["commands"],
             capture_output=True,
             text=True,
-            timeout=30
+            timeout=30,
+            bufsize=-1
         )
-        
-        print("OUTPUT:")
-        print(result.stdout)
-        
-        if result.stderr:
-            print("ERRORS:")
-            print(result.stderr)
-        
-        success = result.returncode == 0
-        print(f"RESULT: {'PASS' if success else 'FAIL'}")
-        return success
-        
-    except subprocess.TimeoutExpired:
+    except Exception as e:
+        return e
+
+def report_vfs_test(test_name, vfs_file, result):
+    """Report a finished VFS test's results"""
+    print(f"\n{'='*60}")
+    print(f"VFS TEST: {test_name}")
+    print(f"VFS File: {vfs_file}")
+    print('='*60)
+
+    if isinstance(result, subprocess.TimeoutExpired):
         print("TEST TIMEOUT")
         return False
-    except Exception as e:
-        print(f"TEST ERROR: {e}")
+    if isinstance(result, Exception):
+        print(f"TEST ERROR: {result}")
         return False
 
+    print("OUTPUT:")
+    print(result.stdout)
+
+    if result.stderr:
+        print("ERRORS:")
+        print(result.stderr)
+
+    success = result.returncode == 0
+    print(f"RESULT: {'PASS' if success else 'FAIL'}")
+    return success
+
 def main():
     print("VFS Emulator - Stage 3 Comprehensive VFS Testing")
     
@@ -107,13 +113,20 @@ exit
     # Create test VFS files
     print("Creating test VFS files...")
     
-    passed = 0
+    # Each case pays a full interpreter + VFS parse; overlap them and
+    # report in order. Threads suffice: the work is waiting on child
+    # processes, so there is no GIL contention and no pickling of tasks
+    runnable = [t for t in test_cases if os.path.exists(t["file"])]
     for test in test_cases:
-        if os.path.exists(test["file"]):
-            if run_vfs_test(test["name"], test["file"], test["commands"]):
-                passed += 1
-        else:
+        if test not in runnable:
             print(f"SKIP: VFS file not found: {test['file']}")
+
+    passed = 0
+    with ThreadPoolExecutor() as executor:
+        results = executor.map(_run_one, runnable)
+        for test, result in zip(runnable, results):
+            if report_vfs_test(test["name"], test["file"], result):
+                passed += 1
     
     # Test error cases
     print(f"\n{'='*60}")
@@ -3,80 +3,274 @@
 Demo script for Stage 2: Configuration
 """
 
+import asyncio
+import collections
+import contextlib
+import io
+import mmap
 import os
-import subprocess
+import py_compile
 import sys
 
-def run_command(cmd, description):
-    """Run a command and display output"""
-    print(f"\n{'='*60}")
-    print(f"DEMO: {description}")
-    print(f"COMMAND: {cmd}")
-    print(f"{'='*60}")
-    
+# Per-stream cap on retained child output lines; runaway children can
+# no longer grow the driver's memory without bound
+_DRAIN_MAXLEN = 10000
+
+# Shared pieces of every demo invocation, built once
+_MAIN = (sys.executable, "main.py")
+_SEP = "=" * 60
+
+# Closing summary is immutable; build it once instead of a print per line
+_SUMMARY = "\n".join((
+    "",
+    _SEP,
+    "STAGE 2 DEMO COMPLETED",
+    "Implemented features:",
+    "✓ Command line argument parsing",
+    "✓ VFS path parameter",
+    "✓ Startup script parameter",
+    "✓ Debug mode with parameter output",
+    "✓ Script execution with comment support",
+    "✓ Error handling for script execution",
+    "✓ OS testing scripts",
+    _SEP,
+)) + "\n"
+
+# Demo cases: (argv, description, in_process, stdin_text, capture, guard).
+# In-process cases run via invoke() with stdin_text injected; the rest
+# spawn a child emulator. capture=False emits straight to stdout as the
+# demo runs instead of buffering through a StringIO. guard=False
+# bypasses the missing-fixture pre-check for demos that deliberately
+# reference absent files to show the emulator's own error handling.
+CASES = (
+    # Test 1: Basic usage with debug
+    (("--debug",),
+     "Basic emulator with debug output", False, None, True, True),
+    # Test 2: With startup script — runs the script and exits on stdin
+    # EOF, so it runs in-process with an injected empty stdin
+    (("--script", "startup_demo.txt", "--debug"),
+     "Emulator with startup script execution", True, "", True, True),
+    # Test 3: With both VFS path and script — test_vfs.xml is absent on
+    # purpose, so the child's VFS-load error is the demo
+    (("--vfs", "./test_vfs.xml", "--script", "test_script.txt", "--debug"),
+     "Emulator with both VFS path and startup script", False, None, True,
+     False),
+    # Test 4: Error case - non-existent script — the child's handling of
+    # the missing script is the demo
+    (("--script", "nonexistent.txt", "--debug"),
+     "Error handling for non-existent script", False, None, True, False),
+    # Test 5: Help message — argparse prints and exits before any stdin
+    # or VFS work, so it runs in-process and unbuffered
+    (("--help",),
+     "Command line help display", True, None, False, True),
+)
+
+async def _drain(stream, sink):
+    """Append a stream's lines to sink as they arrive"""
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+        sink.append(line)
+
+def invoke(argv, stdin_text=None, capture=True):
+    """Run the emulator in-process with the given argv.
+
+    Skips the interpreter-startup cost of a child process. stdin_text,
+    when given, replaces sys.stdin for the run (an empty string means
+    immediate EOF). With capture=False the emulator writes straight to
+    stdout and the returned output is None, skipping the StringIO
+    round-trip. Only suitable for demos that do not need crash
+    isolation. Returns (exit_code, captured_stdout_or_None).
+    """
+    saved_argv = sys.argv
+    saved_stdin = sys.stdin
+    buffer = io.StringIO() if capture else None
+    exit_code = 0
+    sys.argv = ["main.py"] + list(argv)
+    if stdin_text is not None:
+        sys.stdin = io.StringIO(stdin_text)
     try:
-        if isinstance(cmd, list):
-            result = subprocess.run(cmd, capture_output=True, text=True)
-        else:
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        
-        if result.stdout:
-            print("OUTPUT:")
-            print(result.stdout)
-        if result.stderr:
-            print("ERRORS:")
-            print(result.stderr)
-            
-        return result.returncode == 0
+        # Imported under the patched argv so argparse picks up the right
+        # program name; cached after the first call
+        import main as emulator_main
+        with contextlib.ExitStack() as stack:
+            if capture:
+                stack.enter_context(contextlib.redirect_stdout(buffer))
+            try:
+                emulator_main.main()
+            except SystemExit as e:
+                exit_code = e.code or 0
+    finally:
+        sys.argv = saved_argv
+        sys.stdin = saved_stdin
+
+    return exit_code, buffer.getvalue() if capture else None
+
+async def run_in_process(argv, description, stdin_text=None, capture=True):
+    """Run one demo via invoke(), formatted like run_command.
+
+    With capture=False the banner and emulator output go straight to
+    stdout as the demo runs and the returned block is None.
+    """
+    lines = [f"\n{_SEP}",
+             f"DEMO: {description}",
+             f"COMMAND: {list(_MAIN) + list(argv)}",
+             _SEP]
+
+    if not capture:
+        sys.stdout.write("\n".join(lines) + "\nOUTPUT:\n")
+        try:
+            exit_code, _ = invoke(argv, stdin_text, capture=False)
+            success = exit_code == 0
+        except Exception as e:
+            sys.stdout.write(f"Error executing command: {e}\n")
+            success = False
+        return success, None
+
+    try:
+        exit_code, output = invoke(argv, stdin_text)
+        if output:
+            lines.append("OUTPUT:")
+            lines.append(output)
+        success = exit_code == 0
     except Exception as e:
-        print(f"Error executing command: {e}")
-        return False
+        lines.append(f"Error executing command: {e}")
+        success = False
+
+    return success, "\n".join(lines).encode()
+
+def _prewarm_main():
+    """Precompile main.py and ask the kernel to fault its pages in.
+
+    Every child imports the same source; compiling the bytecode cache
+    once up front and advising the page cache means no child pays for
+    either. Best effort — returns the held mmap (or None) so the pages
+    stay referenced across the spawns.
+    """
+    try:
+        py_compile.compile("main.py", doraise=True)
+    except Exception:
+        pass
+
+    try:
+        with open("main.py", "rb") as source:
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        mapped.madvise(mmap.MADV_WILLNEED)
+        return mapped
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _pin_driver():
+    """Pin the driver process to one CPU (best effort).
+
+    The driver only formats output and waits on pipes; keeping it off
+    the other cores leaves them to the child emulators. Children
+    inherit the mask, so each spawn is spread back out by _unpin_child.
+    """
+    try:
+        os.sched_setaffinity(0, {0})
+    except (AttributeError, OSError):
+        pass
+
+def _unpin_child(pid):
+    """Reset a child's CPU mask to all cores (best effort)"""
+    try:
+        os.sched_setaffinity(pid, range(os.cpu_count() or 1))
+    except (AttributeError, OSError, ProcessLookupError):
+        pass
+
+def _missing_fixture(cmd):
+    """Return the first file a --script/--vfs flag references that does
+    not exist, or None"""
+    for i, arg in enumerate(cmd[:-1]):
+        if arg in ("--script", "--vfs") and not os.path.exists(cmd[i + 1]):
+            return cmd[i + 1]
+    return None
+
+async def run_command(cmd, description, guard=True):
+    """Run a command and return its formatted demo block as bytes.
+
+    With guard=True, a command referencing a missing --script/--vfs
+    file is skipped before spawning; demos whose point is the child's
+    own missing-file handling pass guard=False.
+    """
+    # Child output stays bytes from the pipe to the final write; only
+    # the driver's own banner text is encoded
+    lines = [f"\n{_SEP}".encode(),
+             f"DEMO: {description}".encode(),
+             f"COMMAND: {cmd}".encode(),
+             _SEP.encode()]
+
+    # A one-stat check beats spawning an interpreter only to have the
+    # child report the missing file
+    if guard:
+        missing = _missing_fixture(cmd)
+        if missing is not None:
+            lines.append(f"SKIPPED: referenced file does not exist: {missing}".encode())
+            return False, b"\n".join(lines)
+
+    try:
+        # Every case is an argv list now; exec directly with no shell
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _unpin_child(proc.pid)
+
+        # Drain both pipes concurrently while waiting; a child that fills
+        # one pipe while the other is read cannot deadlock the driver
+        out_lines = collections.deque(maxlen=_DRAIN_MAXLEN)
+        err_lines = collections.deque(maxlen=_DRAIN_MAXLEN)
+        await asyncio.gather(_drain(proc.stdout, out_lines),
+                             _drain(proc.stderr, err_lines),
+                             proc.wait())
+
+        if out_lines:
+            lines.append(b"OUTPUT:")
+            lines.append(b''.join(out_lines))
+        if err_lines:
+            lines.append(b"ERRORS:")
+            lines.append(b''.join(err_lines))
+
+        success = proc.returncode == 0
+    except Exception as e:
+        lines.append(f"Error executing command: {e}".encode())
+        success = False
+
+    return success, b"\n".join(lines)
+
+async def main():
+    _pin_driver()
+    source_map = _prewarm_main()
 
-def main():
     print("VFS Emulator - Stage 2: Configuration Demo")
     print("This demo shows all new features implemented in Stage 2")
-    
-    # Test 1: Basic usage with debug
-    run_command(
-        [sys.executable, "main.py", "--debug"], 
-        "Basic emulator with debug output"
-    )
-    
-    # Test 2: With startup script
-    run_command(
-        [sys.executable, "main.py", "--script", "startup_demo.txt", "--debug"],
-        "Emulator with startup script execution"
-    )
-    
-    # Test 3: With both VFS path and script
-    run_command(
-        [sys.executable, "main.py", "--vfs", "./test_vfs.xml", "--script", "test_script.txt", "--debug"],
-        "Emulator with both VFS path and startup script"
-    )
-    
-    # Test 4: Error case - non-existent script
-    run_command(
-        [sys.executable, "main.py", "--script", "nonexistent.txt", "--debug"],
-        "Error handling for non-existent script"
-    )
-    
-    # Test 5: Help message
-    run_command(
-        [sys.executable, "main.py", "--help"],
-        "Command line help display"
-    )
-    
-    print("\n" + "="*60)
-    print("STAGE 2 DEMO COMPLETED")
-    print("Implemented features:")
-    print("✓ Command line argument parsing")
-    print("✓ VFS path parameter")
-    print("✓ Startup script parameter") 
-    print("✓ Debug mode with parameter output")
-    print("✓ Script execution with comment support")
-    print("✓ Error handling for script execution")
-    print("✓ OS testing scripts")
-    print("="*60)
+
+    # The demos are independent child processes; start them all and let
+    # the event loop overlap their startup and I/O, then print each
+    # buffered block in the original order
+    results = await asyncio.gather(*(
+        run_in_process(list(argv), description, stdin_text, capture)
+        if in_process
+        else run_command([*_MAIN, *argv], description, guard)
+        for argv, description, in_process, stdin_text, capture, guard in CASES
+    ))
+
+    # One write flushes every buffered block instead of a print per line
+    # of banner and output; going through the buffer layer skips
+    # re-encoding the child bytes. Uncaptured demos already emitted
+    # their block directly.
+    sys.stdout.flush()
+    sys.stdout.buffer.write(b"\n".join(block for _, block in results
+                                       if block is not None) + b"\n")
+    sys.stdout.flush()
+
+    if source_map is not None:
+        source_map.close()
+
+    sys.stdout.write(_SUMMARY)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())